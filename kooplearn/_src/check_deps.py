@@ -1,3 +1,6 @@
+from functools import lru_cache
+
+
 def check_torch_deps():
     try:
         import lightning
@@ -7,16 +10,23 @@ def check_torch_deps():
         )
 
 
+@lru_cache(maxsize=None)
+def _import_torch():
+    # A failed import is not cached by Python and would be retried, scanning sys.path, on every call.
+    try:
+        import torch
+    except ImportError:
+        torch = None
+    return torch
+
+
 def parse_backend(backend: str):
     if backend not in ["auto", "numpy", "torch"]:
         raise ValueError(
             f"Invalid backend {backend}. Accepted values are 'auto', 'numpy', or 'torch'."
         )
     # Check if torch is available
-    try:
-        import torch
-    except ImportError:
-        torch = None
+    torch = _import_torch()
     return torch, backend
 
 
@@ -1,14 +1,69 @@
+import hashlib
 import logging
+import threading
+from collections import OrderedDict
 from typing import Optional
 from warnings import warn
 
 import numpy as np
+from scipy.linalg import get_blas_funcs
 from sklearn.utils import check_array
 
 from kooplearn._src.utils import topk
 
 logger = logging.getLogger("kooplearn")
 
+# Upper bound on the memory held by the eigh cache, 0 disables it
+_EIGH_CACHE_MAXBYTES = 64 * 1024**2
+_eigh_cache: OrderedDict = OrderedDict()
+_eigh_cache_nbytes = 0
+_eigh_cache_lock = threading.Lock()
+
+
+def cached_eigh(M: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Eigendecomposition of the symmetric matrix M, memoized on the content of M.
+
+    Fitting several estimators on the same covariance (e.g. sweeping the rank) factorizes it only once. The returned arrays are read-only, as they are shared between calls. The least recently used factorizations are evicted once the cache exceeds ``_EIGH_CACHE_MAXBYTES``; use :func:`clear_eigh_cache` to release it.
+    """
+    global _eigh_cache_nbytes
+    M = np.asarray(M)
+    # Factorizations which could not be cached are not hashed either
+    if M.shape[0] * M.itemsize + M.nbytes > _EIGH_CACHE_MAXBYTES:
+        return np.linalg.eigh(M)
+    M = np.ascontiguousarray(M)
+    key = (
+        M.shape,
+        M.dtype.str,
+        hashlib.blake2b(memoryview(M), digest_size=16).digest(),
+    )
+    with _eigh_cache_lock:
+        cached = _eigh_cache.get(key)
+        if cached is not None:
+            _eigh_cache.move_to_end(key)
+            return cached
+    w, v = np.linalg.eigh(M)
+    w.setflags(write=False)
+    v.setflags(write=False)
+    with _eigh_cache_lock:
+        if key not in _eigh_cache:
+            _eigh_cache[key] = (w, v)
+            _eigh_cache_nbytes += w.nbytes + v.nbytes
+        while _eigh_cache_nbytes > _EIGH_CACHE_MAXBYTES:
+            _, (_w, _v) = _eigh_cache.popitem(last=False)
+            _eigh_cache_nbytes -= _w.nbytes + _v.nbytes
+    return w, v
+
+
+def clear_eigh_cache():
+    """
+    Releases the factorizations memoized by :func:`cached_eigh`.
+    """
+    global _eigh_cache_nbytes
+    with _eigh_cache_lock:
+        _eigh_cache.clear()
+        _eigh_cache_nbytes = 0
+
 
 def spd_neg_pow(
     M: np.ndarray,
@@ -21,7 +76,7 @@ def spd_neg_pow(
     """
     if cutoff is None:
         cutoff = 10.0 * M.shape[0] * np.finfo(M.dtype).eps
-    w, v = np.linalg.eigh(M)
+    w, v = cached_eigh(M)
     if strategy == "trunc":
         sanitized_w = np.where(w <= cutoff, 1.0, w)
         inv_w = np.where(
@@ -32,7 +87,22 @@ def spd_neg_pow(
         inv_w = ((w + cutoff) ** np.abs(exponent)) ** np.sign(exponent)
     else:
         raise NotImplementedError(f"Strategy {strategy} not implemented")
-    return np.linalg.multi_dot([v, np.diag(inv_w), v.T])
+    return (v * inv_w) @ v.T
+
+
+def symmetric_outer(A: np.ndarray) -> np.ndarray:
+    """
+    Computes the symmetric product :math:`AA^T` with a single BLAS ``syrk`` call, which evaluates only one triangle of the result.
+    """
+    syrk = get_blas_funcs("syrk", (A,))
+    if A.flags.f_contiguous:
+        C = syrk(1.0, A, trans=0)
+    else:
+        # A.T is Fortran-contiguous: no copy is needed to compute (A.T).T @ A.T
+        C = syrk(1.0, np.ascontiguousarray(A).T, trans=1)
+    # syrk fills the upper triangle only
+    C += np.triu(C, 1).T
+    return C
 
 
 def weighted_norm(A: np.ndarray, M: Optional[np.ndarray] = None):
@@ -215,19 +285,21 @@ def eigh_rank_reveal(
     if rcond is None:
         rcond = 10.0 * values.shape[0] * np.finfo(values.dtype).eps
     top_vals = topk(values, rank)
-    vectors = vectors[:, top_vals.indices]
     values = top_vals.values
 
-    _ftest = values > rcond
-    if all(_ftest):
+    # Fast path: values are sorted in descending order (NaNs, if any, come first), so checking the last one suffices.
+    if values[-1] > rcond and not np.isnan(values[0]):
+        vectors = vectors[:, top_vals.indices]
         rsqrt_vals = (np.sqrt(values)) ** -1
     else:
+        _ftest = values > rcond
         first_invalid = np.argmax(
             ~_ftest
         )  # In the case of multiple occurrences of the maximum values, the indices corresponding to the first occurrence are returned.
         _first_discarded_val = np.max(np.abs(values[first_invalid:]))
         values = values[_ftest]
-        vectors = vectors[:, _ftest]
+        # Gather the retained columns directly, with a single copy of the eigenvectors.
+        vectors = vectors[:, top_vals.indices[_ftest]]
 
         if verbose:
             logger.warning(
@@ -239,11 +311,14 @@ def eigh_rank_reveal(
 
 
 def cov(X: np.ndarray, Y: Optional[np.ndarray] = None):
-    X = np.atleast_2d(X)
+    if not (isinstance(X, np.ndarray) and X.ndim >= 2):
+        X = np.atleast_2d(X)
     if X.ndim > 2:
         raise ValueError(f"Input array has more than 2 dimensions ({X.ndim}).")
-    rnorm = (X.shape[0]) ** (-0.5)
-    X = X * rnorm
+    # Integer and boolean inputs would overflow (or be reduced logically) in the matmul.
+    X = X.astype(np.result_type(X, 1.0), copy=False)
+    # Normalize the (n_features, n_features) product rather than the (n_samples, n_features) inputs.
+    rnorm = (X.shape[0]) ** (-1.0)
 
     if Y is None:
         c = X.T @ X
@@ -252,9 +327,11 @@ def cov(X: np.ndarray, Y: Optional[np.ndarray] = None):
             raise ValueError(
                 f"Shape mismatch: the covariance between two arrays can be computed only if they have the same initial dimension. Got {X.shape[0]} and {Y.shape[0]}."
             )
-        Y = np.atleast_2d(Y)
+        if not (isinstance(Y, np.ndarray) and Y.ndim >= 2):
+            Y = np.atleast_2d(Y)
         if Y.ndim > 2:
             raise ValueError(f"Input array has more than 2 dimensions ({Y.ndim}).")
-        Y = Y * rnorm
+        Y = Y.astype(np.result_type(Y, 1.0), copy=False)
         c = X.T @ Y
+    c *= rnorm
     return c
@@ -433,7 +433,7 @@ def estimator_eig(
     vr = vr / norm_r
 
     # Bi-orthogonality of left eigenfunctions
-    norm_l = np.diag(np.linalg.multi_dot([vl.T, W_YX, vr]))
+    norm_l = np.sum(vl * (W_YX @ vr), axis=0)
     norm_l = np.where(np.abs(norm_l) < rcond, np.inf, norm_l)
     vl = vl / norm_l
     return values, V @ vl, U @ vr
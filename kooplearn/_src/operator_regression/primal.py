@@ -1,11 +1,25 @@
-from typing import Optional
+from typing import NamedTuple, Optional
 
 import numpy as np
-from scipy.linalg import eig, eigh, solve
-from scipy.sparse.linalg import eigsh
-from sklearn.utils.extmath import randomized_svd
-
-from kooplearn._src.linalg import eigh_rank_reveal, spd_neg_pow, weighted_norm
+from scipy.linalg import (
+    cho_factor,
+    cho_solve,
+    eig,
+    eigh,
+    get_lapack_funcs,
+    lu_factor,
+    lu_solve,
+    qr,
+)
+from scipy.sparse.linalg import LinearOperator, eigsh
+
+from kooplearn._src.linalg import (
+    cached_eigh,
+    eigh_rank_reveal,
+    spd_neg_pow,
+    symmetric_outer,
+    weighted_norm,
+)
 from kooplearn._src.utils import fuzzy_parse_complex, topk
 
 
@@ -21,18 +35,30 @@ def fit_reduced_rank_regression(
     else:
         dim = C_X.shape[0]
         reg_input_covariance = C_X + tikhonov_reg * np.identity(dim, dtype=C_X.dtype)
-        _crcov = C_XY @ C_XY.T
+        _crcov = symmetric_outer(C_XY)
         if svd_solver == "arnoldi":
+            # Provide M^-1 through a Cholesky factorization, rather than letting ARPACK LU-factorize M.
+            cholesky_decomposition = cho_factor(reg_input_covariance)
+            Minv = LinearOperator(
+                reg_input_covariance.shape,
+                matvec=lambda v: cho_solve(cholesky_decomposition, v),
+                dtype=reg_input_covariance.dtype,
+            )
             # Adding a small buffer to the Arnoldi-computed eigenvalues.
-            values, vectors = eigsh(_crcov, rank + 3, M=reg_input_covariance)
+            values, vectors = eigsh(_crcov, rank + 3, M=reg_input_covariance, Minv=Minv)
         else:
-            values, vectors = eigh(_crcov, reg_input_covariance)
+            # Only the top-rank eigenpairs are needed.
+            values, vectors = eigh(
+                _crcov,
+                reg_input_covariance,
+                subset_by_index=[max(dim - rank, 0), dim - 1],
+            )
 
         top_eigs = topk(values, rank)
         vectors = vectors[:, top_eigs.indices]
 
         _norms = weighted_norm(vectors, reg_input_covariance)
-        vectors = vectors @ np.diag(_norms ** (-1.0))
+        vectors = vectors / _norms
         return vectors
 
 
@@ -44,13 +70,18 @@ def _fit_reduced_rank_regression_noreg(
 ):
     rsqrt_C_X = spd_neg_pow(C_X, -0.5)
     B = rsqrt_C_X @ C_XY
-    _crcov = B @ B.T
+    _crcov = symmetric_outer(B)
     if svd_solver == "arnoldi":
         # Adding a small buffer to the Arnoldi-computed eigenvalues.
         values, vectors = eigsh(_crcov, rank + 3)
+        rcond = None
     else:
-        values, vectors = eigh(_crcov)
-    vectors, _vals, _ = eigh_rank_reveal(values, vectors, rank)
+        dim = _crcov.shape[0]
+        # Only the top-rank eigenpairs are needed.
+        values, vectors = eigh(_crcov, subset_by_index=[max(dim - rank, 0), dim - 1])
+        # Same threshold as for the full spectrum, not the one of the (rank,) subset.
+        rcond = 10.0 * dim * np.finfo(values.dtype).eps
+    vectors, _vals, _ = eigh_rank_reveal(values, vectors, rank, rcond)
     return rsqrt_C_X @ vectors
 
 
@@ -65,25 +96,31 @@ def fit_rand_reduced_rank_regression(
 ):
     dim = C_X.shape[0]
     reg_input_covariance = C_X + tikhonov_reg * np.identity(dim, dtype=C_X.dtype)
-    _crcov = C_XY @ C_XY.T
+    _crcov = symmetric_outer(C_XY)
     rng = np.random.default_rng(rng_seed)
-    sketch = rng.standard_normal(
-        size=(reg_input_covariance.shape[0], rank + n_oversamples)
+    # LAPACK works on Fortran-ordered arrays: allocating them upfront avoids hidden C -> F copies in every solve.
+    sketch = np.asfortranarray(
+        rng.standard_normal(size=(reg_input_covariance.shape[0], rank + n_oversamples))
     )
 
+    # reg_input_covariance is symmetric, hence its transpose is a Fortran-ordered view of the same matrix, which is
+    # factorized in place.
+    cholesky_decomposition = cho_factor(reg_input_covariance.T, overwrite_a=True)
+
     for _ in range(iterated_power):
-        _tmp_sketch = solve(reg_input_covariance, sketch, assume_a="pos")
+        # The sketch is overwritten, as only its solution is used afterwards.
+        _tmp_sketch = cho_solve(cholesky_decomposition, sketch, overwrite_b=True)
         sketch = _crcov @ _tmp_sketch
-        # TODO add power iteration QR normalization.
+        sketch, _ = qr(sketch, mode="economic")  # QR re-orthogonalization
 
-    sketch_p = solve(reg_input_covariance, sketch, assume_a="pos")
+    sketch_p = cho_solve(cholesky_decomposition, sketch)
 
     F_0 = sketch_p.T @ sketch
     F_1 = sketch_p.T @ _crcov @ sketch_p
 
     values, vectors = eigh(F_1, F_0)
     _norms = weighted_norm(vectors, F_0)
-    vectors = vectors @ np.diag(_norms ** (-1.0))
+    vectors = vectors / _norms
     return sketch_p @ vectors[:, topk(values, rank).indices]
 
 
@@ -95,16 +132,18 @@ def fit_principal_component_regression(
 ):
     dim = C_X.shape[0]
     assert rank <= dim, f"Rank too high. The maximum value for this problem is {dim}"
-    reg_input_covariance = C_X + tikhonov_reg * np.identity(dim, dtype=C_X.dtype)
     if svd_solver == "arnoldi":
+        reg_input_covariance = C_X + tikhonov_reg * np.identity(dim, dtype=C_X.dtype)
         values, vectors = eigsh(reg_input_covariance, k=rank, which="LM")
     elif svd_solver == "full":
-        values, vectors = eigh(reg_input_covariance)
+        # C_X + tikhonov_reg * I shares the eigenvectors of C_X, whose factorization is cached.
+        values, vectors = cached_eigh(C_X)
+        values = values + tikhonov_reg
     else:
         raise ValueError(f"Unknown svd_solver {svd_solver}")
 
     vectors, _, rsqrt_evals = eigh_rank_reveal(values, vectors, rank)
-    return vectors @ np.diag(rsqrt_evals)
+    return vectors * rsqrt_evals
 
 
 def fit_rand_principal_component_regression(
@@ -120,16 +159,69 @@ def fit_rand_principal_component_regression(
     assert rank <= dim, f"Rank too high. The maximum value for this problem is {dim}"
     reg_input_covariance = C_X + tikhonov_reg * np.identity(dim, dtype=C_X.dtype)
 
-    vectors, values, _ = randomized_svd(
-        reg_input_covariance,
-        rank,
-        n_oversamples=n_oversamples,
-        n_iter=iterated_power,
-        random_state=rng_seed,
-    )
+    # Randomized eigendecomposition: as reg_input_covariance is symmetric, the range finder needs only products
+    # with it (no transposes), and the final factorization is an eigh of a small (rank + n_oversamples) matrix.
+    rng = np.random.default_rng(rng_seed)
+    sketch = rng.standard_normal(size=(dim, rank + n_oversamples))
+    sketch = reg_input_covariance @ sketch
+    for _ in range(iterated_power):
+        sketch, _ = qr(sketch, mode="economic")  # QR re-orthogonalization
+        sketch = reg_input_covariance @ (reg_input_covariance @ sketch)
+    Q, _ = qr(sketch, mode="economic")
+
+    B = Q.T @ (reg_input_covariance @ Q)
+    values, vectors = eigh(0.5 * (B + B.T))
+    vectors = Q @ vectors
 
     vectors, _, rsqrt_evals = eigh_rank_reveal(values, vectors, rank, rcond)
-    return vectors @ np.diag(rsqrt_evals)
+    return vectors * rsqrt_evals
+
+
+def _cast(dtype: Optional[np.dtype], *arrays: Optional[np.ndarray]):
+    # Working precision of the contractions. dtype = None leaves the arrays untouched.
+    if dtype is None:
+        return arrays
+    return tuple(None if a is None else np.asarray(a, dtype=dtype) for a in arrays)
+
+
+# Powers up to this exponent are cheaper by repeated squaring than through the eigendecomposition.
+MATRIX_POWER_MAX_STEPS = 8
+
+
+class PredictFactorization(NamedTuple):
+    M: np.ndarray  # U.T @ C_XY @ U
+    values: np.ndarray  # Eigenvalues of M
+    vectors: np.ndarray  # Right eigenvectors of M
+    lu_piv: tuple  # LU factorization of the eigenvectors, as returned by lu_factor
+    rcond: float  # Estimate of the reciprocal condition number of the eigenvectors
+
+
+def predict_factorization(
+    U: np.ndarray,  # Projection matrix, as returned by the fit functions defined above
+    C_XY: np.ndarray,  # Cross-covariance matrix
+    C_XY_U: Optional[np.ndarray] = None,  # Precomputed C_XY @ U, computed if None
+    dtype: Optional[np.dtype] = None,  # Working precision, see predict
+) -> PredictFactorization:
+    U, C_XY, C_XY_U = _cast(dtype, U, C_XY, C_XY_U)
+    if C_XY_U is None:
+        C_XY_U = C_XY @ U
+    M = U.T @ C_XY_U
+    values, vectors = eig(M)
+    lu_piv = lu_factor(vectors)
+    # LAPACK gecon estimates the condition number from the LU factors, without an SVD.
+    (gecon,) = get_lapack_funcs(("gecon",), (lu_piv[0],))
+    rcond, _ = gecon(lu_piv[0], np.linalg.norm(vectors, 1), norm="1")
+    return PredictFactorization(M, values, vectors, lu_piv, rcond)
+
+
+def _factorized_power(factorization: PredictFactorization, exponent: int) -> np.ndarray:
+    M, values, vectors, lu_piv, rcond = factorization
+    # A (near-)defective M has an ill-conditioned eigenbasis: use repeated squaring instead.
+    if exponent <= MATRIX_POWER_MAX_STEPS or rcond < np.finfo(M.dtype).eps ** 0.5:
+        return np.linalg.matrix_power(M, exponent)
+    # M^n = W diag(w^n) W^-1 is the solution X of W.T X.T = (W diag(w^n)).T
+    power = lu_solve(lu_piv, (vectors * values**exponent).T, trans=1).T
+    return power.real if np.isrealobj(M) else power
 
 
 def predict(
@@ -139,26 +231,51 @@ def predict(
     phi_Xin: np.ndarray,  # Feature map evaluated on the initial conditions
     phi_X: np.ndarray,  # Feature map evaluated on the training input data
     obs_train_Y: np.ndarray,  # Observable to be predicted evaluated on the output training data
+    C_XY_U: Optional[np.ndarray] = None,  # Precomputed C_XY @ U, computed if None
+    dtype: Optional[np.dtype] = None,  # Working precision, e.g. np.float32
+    factorization: Optional[PredictFactorization] = None,  # From predict_factorization
 ):
     # G = U U.T C_XY
     # G^n = (U)(U.T C_XY U)^(n-1)(U.T C_XY)
+    # Given the eigendecomposition of U.T C_XY U, its powers are computed with a single solve.
+    U, C_XY, phi_Xin, phi_X, obs_train_Y, C_XY_U = _cast(
+        dtype, U, C_XY, phi_Xin, phi_X, obs_train_Y, C_XY_U
+    )
     num_train = phi_X.shape[0]
     phi_Xin_dot_U = phi_Xin @ U
-    U_C_XY_U = np.linalg.multi_dot([U.T, C_XY, U])
-    U_phi_X_obs_Y = np.linalg.multi_dot([U.T, phi_X.T, obs_train_Y]) * (num_train**-1)
-    M = np.linalg.matrix_power(U_C_XY_U, num_steps - 1)
-    return np.linalg.multi_dot([phi_Xin_dot_U, M, U_phi_X_obs_Y])
+    U_phi_X_obs_Y = (phi_X @ U).T @ obs_train_Y
+    U_phi_X_obs_Y *= num_train**-1
+    if factorization is None:
+        if C_XY_U is None:
+            C_XY_U = C_XY @ U
+        M = np.linalg.matrix_power(U.T @ C_XY_U, num_steps - 1)
+    else:
+        M = _factorized_power(factorization, num_steps - 1)
+    return phi_Xin_dot_U @ (M @ U_phi_X_obs_Y)
 
 
-def estimator_eig(
+class EigFactorization(NamedTuple):
+    values: np.ndarray  # Eigenvalues, sorted
+    lv: np.ndarray  # Left eigenvectors, biorthogonal to rv
+    rv: np.ndarray  # Right eigenvectors, normalized
+    U_lv: np.ndarray  # Satisfies lv = C_XY.T @ U_lv
+
+
+def eig_factorization(
     U: np.ndarray,  # Projection matrix, as returned by the fit functions defined above
     C_XY: np.ndarray,  # Cross-covariance matrix
-):
+    C_XY_U: Optional[np.ndarray] = None,  # Precomputed C_XY @ U, computed if None
+    dtype: Optional[np.dtype] = None,  # Working precision, e.g. np.float32
+) -> EigFactorization:
     # Using the trick described in https://arxiv.org/abs/1905.11490
-    M = np.linalg.multi_dot([U.T, C_XY, U])
+    U, C_XY, C_XY_U = _cast(dtype, U, C_XY, C_XY_U)
+    if C_XY_U is None:
+        C_XY_U = C_XY @ U
+    M = U.T @ C_XY_U
     values, lv, rv = eig(M, left=True, right=True)
 
-    values = fuzzy_parse_complex(values)
+    # Eigenvalues are parsed with the tolerance of the working precision, then sorted in double precision.
+    values = fuzzy_parse_complex(values).astype(np.complex128)
 
     r_perm = np.argsort(values)
     l_perm = np.argsort(values.conj())
@@ -167,13 +284,25 @@ def estimator_eig(
     # Normalization in RKHS norm
     rv = U @ rv
     rv = rv[:, r_perm]
-    rv = rv / np.linalg.norm(rv, axis=0)
+    rv *= np.einsum("ij,ij->j", rv.conj(), rv).real ** -0.5
     # Biorthogonalization
-    lv = np.linalg.multi_dot([C_XY.T, U, lv])
-    lv = lv[:, l_perm]
-    l_norm = np.sum(lv * rv, axis=0)
-    lv = lv / l_norm
+    U_lv = U @ lv
+    U_lv = U_lv[:, l_perm]
+    lv = C_XY.T @ U_lv
+    l_norm = np.einsum("ij,ij->j", lv, rv)
+    lv /= l_norm
+    U_lv /= l_norm
+
+    return EigFactorization(values, lv, rv, U_lv)
 
+
+def estimator_eig(
+    U: np.ndarray,  # Projection matrix, as returned by the fit functions defined above
+    C_XY: np.ndarray,  # Cross-covariance matrix
+    C_XY_U: Optional[np.ndarray] = None,  # Precomputed C_XY @ U, computed if None
+    dtype: Optional[np.dtype] = None,  # Working precision, e.g. np.float32
+):
+    values, lv, rv, _ = eig_factorization(U, C_XY, C_XY_U, dtype=dtype)
     return values, lv, rv
 
 
@@ -182,31 +311,22 @@ def estimator_modes(
     C_XY: np.ndarray,  # Cross-covariance matrix
     phi_X: np.ndarray,  # Feature map evaluated on the training input data
     phi_Xin: np.ndarray,  # Feature map evaluated on the initial conditions
+    factorization: Optional[
+        EigFactorization
+    ] = None,  # Output of eig_factorization(U, C_XY), computed if None
+    dtype: Optional[np.dtype] = None,  # Working precision, e.g. np.float32
 ):
-    # Using the trick described in https://arxiv.org/abs/1905.11490
-    M = np.linalg.multi_dot([U.T, C_XY, U])
-    values, lv, rv = eig(M, left=True, right=True)
-    values = fuzzy_parse_complex(values)
-    r_perm = np.argsort(values)
-    l_perm = np.argsort(values.conj())
-    # values = values[r_perm]
-
-    # Normalization in RKHS norm
-    rv = U @ rv
-    rv = rv[:, r_perm]
-    rv = rv / np.linalg.norm(rv, axis=0)
-    # Biorthogonalization
-    lv_full = np.linalg.multi_dot([C_XY.T, U, lv])
-    lv_full = lv_full[:, l_perm]
-    lv = lv[:, l_perm]
-    l_norm = np.sum(lv_full * rv, axis=0)
-    lv = lv / l_norm
+    phi_X, phi_Xin = _cast(dtype, phi_X, phi_Xin)
+    if factorization is None:
+        factorization = eig_factorization(U, C_XY, dtype=dtype)
+    values, _, rv, U_lv = factorization
     r_dim = phi_X.shape[0] ** -1.0
 
     # Initial conditions
     rv_in = (phi_Xin @ rv).T  # [rank, num_init_conditions]
     # This should be multiplied on the right by the observable evaluated at the output training data
-    lv_obs = np.linalg.multi_dot([r_dim * phi_X, U, lv]).T
+    lv_obs = (phi_X @ U_lv).T
+    lv_obs *= r_dim
     return (
         rv_in[:, :, None] * lv_obs[:, None, :],
         values,
@@ -220,8 +340,19 @@ def evaluate_eigenfunction(
     return phi_Xin @ lv_or_rv
 
 
+def evaluate_eigenfunctions(
+    phi_Xin: np.ndarray,  # Feature map evaluated on the initial conditions
+    stacked_lv_rv: np.ndarray,  # Stack of eigenvector sets (e.g. left and right), shape [num_sets, num_features, rank]
+):
+    # A single gemm against all the eigenvector sets, instead of one per set
+    num_sets, num_features, rank = stacked_lv_rv.shape
+    vecs = np.moveaxis(stacked_lv_rv, 0, 1).reshape(num_features, num_sets * rank)
+    res = (phi_Xin @ vecs).reshape(phi_Xin.shape[0], num_sets, rank)
+    return np.moveaxis(res, 1, 0)  # [num_sets, num_init_conditions, rank]
+
+
 def svdvals(U, C_XY):
-    M = np.linalg.multi_dot([U, U.T, C_XY])
+    M = U @ (U.T @ C_XY)
     return np.linalg.svd(M, compute_uv=False)
 
 
@@ -99,6 +99,7 @@ class TrajectoryContextDataset(TensorContextDataset):
         context_length: int = 2,
         time_lag: int = 1,
         backend: str = "auto",
+        copy: bool = False,
         **backend_kw,
     ):
         """
@@ -109,6 +110,7 @@ class TrajectoryContextDataset(TensorContextDataset):
             context_length (int, optional): Length of the context window. Default to ``2``.
             time_lag (int, optional): Time lag, i.e. stride, between successive context windows. Default to ``1``.
             backend (str, optional): Specifies the backend to be used (``'numpy'``, ``'torch'``). If set to ``'auto'``, will use the same backend of the trajectory. Default to ``'auto'``.
+            copy (bool, optional): If ``True``, the context windows are copied into a contiguous array. Otherwise they are a strided view of ``trajectory``, and each downstream consumer (e.g. the BLAS calls evaluating covariances) may end up copying them on its own. Set it to ``True`` when the contexts are reused many times. Default to ``False``.
             backend_kw (dict, optional): Keyword arguments to pass to the backend. For example, if ``'torch'``, it is possible to specify the device of the tensor.
         """
         if context_length < 1:
@@ -180,6 +182,12 @@ class TrajectoryContextDataset(TensorContextDataset):
                     trajectory, context_length, time_lag
                 )
 
+        if copy:
+            if torch is not None and torch.is_tensor(self.data):
+                self.data = self.data.contiguous()
+            else:
+                self.data = np.ascontiguousarray(self.data)
+
         self.trajectory = trajectory
         self.time_lag = time_lag
         super().__init__(self.data)
@@ -194,19 +202,31 @@ def _contexts_from_traj_np(trajectory, context_length, time_lag):
             f"length {trajectory.shape[0]}. Try reducing context_length or time_lag."
         )
 
-    data = np.lib.stride_tricks.sliding_window_view(trajectory, window_shape, axis=0)
-
-    idx_map = np.lib.stride_tricks.sliding_window_view(
+    data = _strided_contexts(trajectory, context_length, time_lag)
+    idx_map = _strided_contexts(
         np.arange(trajectory.shape[0], dtype=np.int_).reshape(-1, 1),
-        window_shape,
-        axis=0,
+        context_length,
+        time_lag,
     )
-
-    idx_map = np.moveaxis(idx_map, -1, 1)[:, ::time_lag, ...]
-    data = np.moveaxis(data, -1, 1)[:, ::time_lag, ...]
     return data, TensorContextDataset(idx_map)
 
 
+def _strided_contexts(trajectory, context_length, time_lag):
+    # Read-only view of shape (n_contexts, context_length, *features_shape), built in a single step. Equivalent to
+    # moving the window axis of sliding_window_view next to the batch axis and slicing it with [:, ::time_lag].
+    window_shape = 1 + (context_length - 1) * time_lag
+    n_contexts = trajectory.shape[0] - window_shape + 1
+    shape = (n_contexts, context_length, *trajectory.shape[1:])
+    strides = (
+        trajectory.strides[0],
+        trajectory.strides[0] * time_lag,
+        *trajectory.strides[1:],
+    )
+    return np.lib.stride_tricks.as_strided(
+        trajectory, shape=shape, strides=strides, writeable=False
+    )
+
+
 class MultiTrajectoryContextDataset(TrajectoryContextDataset):
     def __init__(self):
         raise NotImplementedError
@@ -217,6 +237,7 @@ def traj_to_contexts(
     context_window_len: int = 2,
     time_lag: int = 1,
     backend: str = "auto",
+    copy: bool = False,
     **backend_kwargs,
 ):
     """
@@ -227,6 +248,7 @@ def traj_to_contexts(
         context_window_len (int, optional): Length of the context window. Default to ``2``.
         time_lag (int, optional): Time lag, i.e. stride, between successive context windows. Default to ``1``.
         backend (str, optional): Specifies the backend to be used (``'numpy'``, ``'torch'``). If set to ``'auto'``, will use the same backend of the trajectory. Default to ``'auto'``.
+        copy (bool, optional): If ``True``, the context windows are copied into a contiguous array instead of being a strided view of ``trajectory``. Default to ``False``.
         backend_kw (dict, optional): Keyword arguments to pass to the backend. For example, if ``'torch'``, it is possible to specify the device of the tensor.
 
     Returns:
@@ -237,5 +259,6 @@ def traj_to_contexts(
         context_length=context_window_len,
         time_lag=time_lag,
         backend=backend,
+        copy=copy,
         **backend_kwargs,
     )
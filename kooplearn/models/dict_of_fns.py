@@ -213,10 +213,7 @@ class Nonlinear(BaseModel):
                 raise ShapeError(
                     f"The  context length ({data.context_length}) of the validation data does not match the context length of the training data ({self.data_fit.context_length})."
                 )
-            X, Y = data.lookback(self.lookback_len), data.lookback(
-                self.lookback_len, slide_by=1
-            )
-            cov_Xv, cov_Yv, cov_XYv = self._init_covs(X, Y)
+            cov_Xv, cov_Yv, cov_XYv = self._init_covs(data)
         else:
             cov_Xv, cov_Yv, cov_XYv = self.cov_X, self.cov_Y, self.cov_XY
 
@@ -255,6 +252,11 @@ class Nonlinear(BaseModel):
 
         phi_Xin = self.feature_map(X_inference)
         phi_X = self.feature_map(X_fit)
+        # Shared by the predictions of every observable
+        if t - 1 > primal.MATRIX_POWER_MAX_STEPS:
+            predict_kwargs = {"factorization": self._predict_factorization()}
+        else:
+            predict_kwargs = {"C_XY_U": self.cov_XY @ self.U}
 
         results = {}
         for obs_name, obs in parsed_obs.items():
@@ -268,7 +270,9 @@ class Nonlinear(BaseModel):
                     for k in range(num_reencodings):
                         raise NotImplementedError
             else:
-                obs_pred = primal.predict(t, self.U, self.cov_XY, phi_Xin, phi_X, obs)
+                obs_pred = primal.predict(
+                    t, self.U, self.cov_XY, phi_Xin, phi_X, obs, **predict_kwargs
+                )
                 obs_pred = obs_pred.reshape(expected_shapes[obs_name])
                 results[obs_name] = obs_pred
         if len(results) == 1:
@@ -297,11 +301,7 @@ class Nonlinear(BaseModel):
         """
 
         check_is_fitted(self, ["U", "cov_XY", "lookback_len"])
-        if hasattr(self, "_eig_cache"):
-            w, vl, vr = self._eig_cache
-        else:
-            w, vl, vr = primal.estimator_eig(self.U, self.cov_XY)
-            self._eig_cache = (w, vl, vr)
+        w, vl, vr, _ = self._eig_factorization()
 
         if eval_left_on is None and eval_right_on is None:
             # (eigenvalues,)
@@ -314,6 +314,11 @@ class Nonlinear(BaseModel):
             # (eigenvalues, left eigenfunctions)
             phi_Xin = self.feature_map(eval_left_on.lookback(self.lookback_len))
             return w, primal.evaluate_eigenfunction(phi_Xin, vl)
+        elif eval_left_on is eval_right_on:
+            # (eigenvalues, left eigenfunctions, right eigenfunctions) on the same data
+            phi_Xin = self.feature_map(eval_left_on.lookback(self.lookback_len))
+            fn_l, fn_r = primal.evaluate_eigenfunctions(phi_Xin, np.stack([vl, vr]))
+            return w, fn_l, fn_r
         elif eval_left_on is not None and eval_right_on is not None:
             # (eigenvalues, left eigenfunctions, right eigenfunctions)
             phi_Xin_l = self.feature_map(eval_left_on.lookback(self.lookback_len))
@@ -352,7 +357,9 @@ class Nonlinear(BaseModel):
 
         phi_Xin = self.feature_map(X_inference)
         phi_X = self.feature_map(X_fit)
-        _gamma, _eigs = primal.estimator_modes(self.U, self.cov_XY, phi_X, phi_Xin)
+        _gamma, _eigs = primal.estimator_modes(
+            self.U, self.cov_XY, phi_X, phi_Xin, self._eig_factorization()
+        )
 
         results = {}
         for obs_name, obs in parsed_obs.items():
@@ -396,14 +403,29 @@ class Nonlinear(BaseModel):
         """
         return pickle_load(cls, filename)
 
+    def _eig_factorization(self) -> primal.EigFactorization:
+        """Eigendecomposition of the estimator, shared by :func:`eig` and :func:`modes` and cached until the next call to :func:`fit`."""
+        # Models pickled by earlier versions cache a (w, vl, vr) tuple instead
+        if not isinstance(getattr(self, "_eig_cache", None), primal.EigFactorization):
+            self._eig_cache = primal.eig_factorization(self.U, self.cov_XY)
+        return self._eig_cache
+
+    def _predict_factorization(self) -> primal.PredictFactorization:
+        """Eigendecomposition of the estimator restricted to the range of ``U``, used by :func:`predict` and cached until the next call to :func:`fit`."""
+        if not hasattr(self, "_predict_cache"):
+            self._predict_cache = primal.predict_factorization(self.U, self.cov_XY)
+        return self._predict_cache
+
     def _init_covs(
-        self, X: ArrayLike, Y: ArrayLike
+        self, data: TensorContextDataset
     ) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
         """
         Initializes the covariance matrices `cov_X`, `cov_Y`, and `cov_XY`.
 
+        The input and output lookback windows ``data.lookback(self.lookback_len)`` and ``data.lookback(self.lookback_len, slide_by=1)`` overlap on ``lookback_len - 1`` snapshots. The feature map is therefore evaluated only once on each snapshot of the context window, and the two lookback windows are sliced out of the result.
+
         Args:
-            stacked (np.ndarray): Training data of shape ``(n_samples, 2,  *features_shape)``. It should be the result of the function :func:`stack_lookback`.
+            data (TensorContextDataset): Dataset of context windows of length ``self.lookback_len + 1``.
 
         Returns:
             A tuple containing:
@@ -411,8 +433,14 @@ class Nonlinear(BaseModel):
                 - ``cov_Y`` (np.ndarray): Covariance matrix of the feature map evaluated at Y, shape ``(n_features, n_features)``.
                 - ``cov_XY`` (np.ndarray): Cross-covariance matrix of the feature map evaluated at X and Y, shape ``(n_features, n_features)``.
         """
-        X = self.feature_map(X)
-        Y = self.feature_map(Y)
+        context_len = self.lookback_len + 1
+        ctx = np.asanyarray(data.lookback(context_len))
+        _n_samples = ctx.shape[0]
+        ctx = ctx.reshape(_n_samples * context_len, *ctx.shape[2:])
+        feat = self._feature_map(ctx)
+        feat = feat.reshape(_n_samples, context_len, -1)
+        X = feat[:, :-1].reshape(_n_samples, -1)
+        Y = feat[:, 1:].reshape(_n_samples, -1)
 
         cov_X = cov(X)
         cov_Y = cov(Y)
@@ -430,18 +458,16 @@ class Nonlinear(BaseModel):
 
         # Save the lookback length
         self._lookback_len = data.context_length - 1
-        X_fit, Y_fit = data.lookback(self.lookback_len), data.lookback(
-            self.lookback_len, slide_by=1
-        )
-        self.cov_X, self.cov_Y, self.cov_XY = self._init_covs(X_fit, Y_fit)
+        self.cov_X, self.cov_Y, self.cov_XY = self._init_covs(data)
         self.data_fit = data
 
         if self.rank is None:
             self.rank = self.cov_X.shape[0]
             logger.info(f"Rank of the estimator set to {self.rank}")
 
-        if hasattr(self, "_eig_cache"):
-            del self._eig_cache
+        for _cache in ["_eig_cache", "_predict_cache"]:
+            if hasattr(self, _cache):
+                delattr(self, _cache)
 
 
 class Linear(Nonlinear):
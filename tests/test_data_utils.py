@@ -58,3 +58,14 @@ def test_traj_to_contexts(
             assert np.all(
                 res.data[:, i, 0] == np.arange(trj_len - _C + 1) + i * time_lag
             )
+
+
+@pytest.mark.parametrize("time_lag", [1, 3])
+def test_traj_to_contexts_copy(time_lag):
+    trj = np.arange(100, dtype=np.float64).reshape(50, 2)
+    view = traj_to_contexts(trj, 4, time_lag)
+    copied = traj_to_contexts(trj, 4, time_lag, copy=True)
+    assert np.shares_memory(view.data, trj)
+    assert not np.shares_memory(copied.data, trj)
+    assert copied.data.flags.c_contiguous
+    assert np.array_equal(view.data, copied.data)
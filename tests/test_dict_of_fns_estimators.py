@@ -5,6 +5,7 @@ import numpy as np
 import pytest
 from scipy.stats import special_ortho_group
 
+from kooplearn._src.operator_regression import primal
 from kooplearn.abc import FeatureMap
 from kooplearn.data import traj_to_contexts
 from kooplearn.datasets.stochastic import LinearModel
@@ -127,3 +128,22 @@ def test_Nonlinear_fit_predict_eig_modes_save_load(
         assert np.allclose(model.data_fit, restored_model.data_fit)
         assert np.allclose(model.lookback_len, model.lookback_len)
         rmtree(Path(__file__).parent / "tmp/")
+
+
+def test_Nonlinear_legacy_eig_cache():
+    dataset = make_linear_system()
+    _Z = dataset.sample(np.zeros(DIM), NUM_SAMPLES)
+    data = traj_to_contexts(_Z, 2)
+    model = Nonlinear(rank=TRUE_RANK, svd_solver="full").fit(data)
+    vals, lv, rv = model.eig(eval_left_on=data, eval_right_on=data)
+    # Cache layout of models pickled by earlier versions
+    model._eig_cache = primal.estimator_eig(model.U, model.cov_XY)
+    restored_vals, restored_lv, restored_rv = model.eig(
+        eval_left_on=data, eval_right_on=data
+    )
+    assert np.allclose(vals, restored_vals)
+    assert np.allclose(lv, restored_lv)
+    assert np.allclose(rv, restored_rv)
+    model._eig_cache = primal.estimator_eig(model.U, model.cov_XY)
+    modes, _ = model.modes(data)
+    assert modes.shape == (TRUE_RANK,) + data.lookforward(model.lookback_len).shape
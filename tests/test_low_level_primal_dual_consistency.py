@@ -311,3 +311,142 @@ def test_rand_reduced_rank_dual(dt):
     assert _allclose(predict, rand_predict)
     assert _allclose(np.sort(rand_eig.real), np.sort(eig.real))
     assert _allclose(np.sort(rand_eig.imag), np.sort(eig.imag))
+
+
+def test_evaluate_eigenfunctions_batched():
+    num_features = 10
+    rank = 4
+    dataset = Mock(num_features=num_features, rng_seed=42)
+    _Z = dataset.sample(None, 100)
+    X, Y = _Z[:-1], _Z[1:]
+    rdim = np.true_divide(1, X.shape[0])
+    C_X = rdim * ((X.T) @ X)
+    C_XY = rdim * ((X.T) @ Y)
+    U = primal.fit_reduced_rank_regression(C_X, C_XY, 1e-3, rank, svd_solver="full")
+    _, lv, rv = primal.estimator_eig(U, C_XY)
+
+    fn_l, fn_r = primal.evaluate_eigenfunctions(X, np.stack([lv, rv]))
+    assert _allclose(fn_l, primal.evaluate_eigenfunction(X, lv))
+    assert _allclose(fn_r, primal.evaluate_eigenfunction(X, rv))
+
+
+@pytest.mark.parametrize("dt", [1, 3])
+def test_primal_float32_working_precision(dt):
+    num_features = 10
+    rank = 4
+    dataset = Mock(num_features=num_features, rng_seed=42)
+    _Z = dataset.sample(None, 100)
+    X, Y = _Z[:-1], _Z[1:]
+    rdim = np.true_divide(1, X.shape[0])
+    C_X = rdim * ((X.T) @ X)
+    C_XY = rdim * ((X.T) @ Y)
+    U = primal.fit_reduced_rank_regression(C_X, C_XY, 1e-3, rank, svd_solver="full")
+
+    pred = primal.predict(dt, U, C_XY, X, X, Y)
+    pred_32 = primal.predict(dt, U, C_XY, X, X, Y, dtype=np.float32)
+    assert pred_32.dtype == np.float32
+    assert _allclose(pred, pred_32)
+
+    eigs, _, _ = primal.estimator_eig(U, C_XY)
+    eigs_32, lv_32, rv_32 = primal.estimator_eig(U, C_XY, dtype=np.float32)
+    assert eigs_32.dtype == np.complex128
+    assert rv_32.dtype == np.complex64
+    assert _allclose(eigs, eigs_32)
+
+
+@pytest.mark.parametrize("dt", [1, 2, 5, 30])
+def test_primal_predict_defective_operator(dt):
+    num_features = 4
+    J = 0.9 * np.identity(num_features) + np.eye(num_features, k=1)  # Jordan block
+    rng = np.random.default_rng(42)
+    X = rng.standard_normal((200, num_features))
+    Y = X @ J.T
+    X_test = rng.standard_normal((10, num_features))
+    rdim = np.true_divide(1, X.shape[0])
+    C_X = rdim * ((X.T) @ X)
+    C_XY = rdim * ((X.T) @ Y)
+    U = primal.fit_reduced_rank_regression(
+        C_X, C_XY, 0.0, num_features, svd_solver="full"
+    )
+
+    expected = X_test @ np.linalg.matrix_power(J.T, dt)
+    pred = primal.predict(dt, U, C_XY, X_test, X, Y)
+    assert np.allclose(pred, expected, rtol=1e-8, atol=1e-8)
+    factorization = primal.predict_factorization(U, C_XY)
+    pred = primal.predict(dt, U, C_XY, X_test, X, Y, factorization=factorization)
+    assert np.allclose(pred, expected, rtol=1e-8, atol=1e-8)
+
+
+@pytest.mark.parametrize("dt", [1, 3, 30])
+def test_primal_predict_factorization(dt):
+    num_features = 10
+    rank = 4
+    dataset = Mock(num_features=num_features, rng_seed=42)
+    _Z = dataset.sample(None, 100)
+    X, Y = _Z[:-1], _Z[1:]
+    rdim = np.true_divide(1, X.shape[0])
+    C_X = rdim * ((X.T) @ X)
+    C_XY = rdim * ((X.T) @ Y)
+    U = primal.fit_reduced_rank_regression(C_X, C_XY, 1e-3, rank, svd_solver="full")
+    factorization = primal.predict_factorization(U, C_XY)
+
+    pred = primal.predict(dt, U, C_XY, X[:3], X, Y)
+    assert _allclose(
+        pred, primal.predict(dt, U, C_XY, X[:3], X, Y, factorization=factorization)
+    )
+    # 1-D observables
+    pred_1d = primal.predict(
+        dt, U, C_XY, X[:3], X, Y[:, 0], factorization=factorization
+    )
+    assert pred_1d.shape == (3,)
+    assert _allclose(pred_1d, pred[:, 0])
+
+
+def test_reduced_rank_noreg_full_rank_reveal():
+    num_features = 100
+    rng = np.random.default_rng(42)
+    Q, _ = np.linalg.qr(rng.standard_normal((num_features, num_features)))
+    spectrum = np.zeros(num_features)
+    spectrum[:5] = [1.0, 0.8, 0.6, 0.4, 1e-13]
+    C_X = np.identity(num_features)
+    C_XY = (Q * np.sqrt(spectrum)) @ Q.T
+    U = primal.fit_reduced_rank_regression(C_X, C_XY, 0.0, 5, svd_solver="full")
+    # The 1e-13 direction is below the threshold of the full (num_features,) spectrum
+    assert U.shape == (num_features, 4)
+
+
+@pytest.mark.parametrize("iterated_power", [0, 1, 3])
+@pytest.mark.parametrize("n_oversamples", [5, 20])
+def test_rand_principal_component_regression(iterated_power, n_oversamples):
+    num_features = 20
+    rank = 5
+    tikhonov_reg = 1e-8
+    rng = np.random.default_rng(42)
+    Q, _ = np.linalg.qr(rng.standard_normal((num_features, num_features)))
+    # Spectral gap after the leading eigenvalues: the range finder converges even without power iterations
+    spectrum = np.concatenate(
+        [np.linspace(1.0, 0.5, rank), np.logspace(-6, -9, num_features - rank)]
+    )
+    C_X = (Q * spectrum) @ Q.T
+
+    U = primal.fit_principal_component_regression(C_X, tikhonov_reg, rank, "full")
+    U_rand = primal.fit_rand_principal_component_regression(
+        C_X, tikhonov_reg, rank, n_oversamples, iterated_power, rng_seed=42
+    )
+    # With n_oversamples = 20 the sketch spans the whole space (rank + n_oversamples > num_features)
+    assert U_rand.shape == U.shape
+    assert _allclose(U_rand @ U_rand.T @ C_X, U @ U.T @ C_X)
+
+
+def test_primal_float32_eig_parsing_tolerance():
+    rng = np.random.default_rng(42)
+    S = rng.standard_normal((3, 3)) + 3 * np.identity(3)
+    # Real parts closer than the float32 tolerance, but far above the float64 one
+    C_XY = S @ np.diag([0.5, 0.5 + 3e-7, 0.9]) @ np.linalg.inv(S)
+    U = np.identity(3)
+    eigs_32, _, _ = primal.estimator_eig(U, C_XY, dtype=np.float32)
+    assert eigs_32.dtype == np.complex128
+    assert eigs_32[0] == eigs_32[1]
+    assert np.all(eigs_32.imag == 0.0)
+    eigs, _, _ = primal.estimator_eig(U, C_XY)
+    assert eigs[0] != eigs[1]
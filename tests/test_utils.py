@@ -1,6 +1,8 @@
 import numpy as np
 import pytest
 
+from kooplearn._src import linalg
+from kooplearn._src.linalg import cached_eigh, clear_eigh_cache, cov, symmetric_outer
 from kooplearn._src.utils import parse_cplx_eig, topk
 
 rng = np.random.default_rng(42)  # Global rng
@@ -36,3 +38,54 @@ def test_parse_cplx_eig_(num_reals, num_cplx_pairs):
     assert np.allclose(
         parse_cplx_eig(vec[rand_perm]), vec[: (num_reals + num_cplx_pairs)]
     )
+
+
+def test_cached_eigh():
+    A = rng.random((10, 10))
+    A = A @ A.T
+    w, v = cached_eigh(A)
+    assert np.allclose((v * w) @ v.T, A)
+    # Same content, different array: the factorization is reused
+    w_copy, v_copy = cached_eigh(A.copy())
+    assert w_copy is w and v_copy is v
+    assert not w.flags.writeable
+    clear_eigh_cache()
+    assert cached_eigh(A)[0] is not w
+
+
+def test_cached_eigh_memory_bound(monkeypatch):
+    clear_eigh_cache()
+    A = rng.random((10, 10))
+    A = A @ A.T
+    nbytes = 10 * 8 + 10 * 10 * 8  # Eigenvalues and eigenvectors of one entry
+    monkeypatch.setattr(linalg, "_EIGH_CACHE_MAXBYTES", 2 * nbytes)
+    w_0, _ = cached_eigh(A)
+    cached_eigh(A + np.identity(10))
+    cached_eigh(A + 2 * np.identity(10))
+    # The least recently used entry has been evicted
+    assert cached_eigh(A)[0] is not w_0
+    assert linalg._eigh_cache_nbytes <= 2 * nbytes
+    # Disabled cache
+    monkeypatch.setattr(linalg, "_EIGH_CACHE_MAXBYTES", 0)
+    clear_eigh_cache()
+    w, _ = cached_eigh(A)
+    assert cached_eigh(A)[0] is not w
+    assert len(linalg._eigh_cache) == 0
+
+
+@pytest.mark.parametrize("order", ["C", "F"])
+@pytest.mark.parametrize("dtype", [np.float32, np.float64])
+def test_symmetric_outer(order, dtype):
+    A = np.asarray(rng.random((10, 4)), order=order, dtype=dtype)
+    AAT = symmetric_outer(A)
+    assert AAT.dtype == dtype
+    assert np.allclose(AAT, A @ A.T, atol=1e-6)
+
+
+@pytest.mark.parametrize("dtype", [np.uint8, np.int32, np.bool_])
+def test_cov_non_float_inputs(dtype):
+    X = rng.integers(0, 2 if dtype is np.bool_ else 250, size=(20, 3)).astype(dtype)
+    Y = rng.integers(0, 2 if dtype is np.bool_ else 250, size=(20, 2)).astype(dtype)
+    X_f, Y_f = X.astype(np.float64), Y.astype(np.float64)
+    assert np.allclose(cov(X), X_f.T @ X_f / 20)
+    assert np.allclose(cov(X, Y), X_f.T @ Y_f / 20)